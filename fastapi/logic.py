@@ -2,9 +2,16 @@
 Medical Logic Engine - Rule-based medical analysis and severity scoring
 """
 
-from typing import List, Dict, Literal
+import functools
+import re
+from typing import List, Dict, Iterable, Literal, Sequence, Tuple, FrozenSet
 from dataclasses import dataclass
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick not installed; use the pure-Python trie below
+    ahocorasick = None
+
 MEDICAL_DISCLAIMER = """
 ⚠️ IMPORTANT MEDICAL DISCLAIMER
 
@@ -24,7 +31,7 @@ Always consult a qualified healthcare provider for proper evaluation and treatme
 """
 
 # Emergency keywords that require immediate attention
-EMERGENCY_SYMPTOMS = {
+EMERGENCY_SYMPTOMS: FrozenSet[str] = frozenset({
     "chest pain",
     "severe breathing difficulty",
     "loss of consciousness",
@@ -39,7 +46,29 @@ EMERGENCY_SYMPTOMS = {
     "severe trauma",
     "overdose",
     "uncontrolled seizure"
-}
+})
+assert all(s == s.lower() for s in EMERGENCY_SYMPTOMS), "emergency phrases must be lowercase"
+
+# Keyword pairs that signal an emergency when they appear in the same symptom
+# (e.g. 'vomit' + 'blood'), in either order; checked with plain substring
+# tests, which stay linear in the symptom length
+_EMERGENCY_PAIRS = (
+    ("vomit", "blood"),
+    ("throw", "blood"),
+    ("severe", "bleed"),
+    ("nose", "bleed"),
+    ("continuous", "bleed"),
+    ("ongoing", "bleed"),
+)
+
+# Symptoms are joined with a unit separator so no match can span two symptoms
+_SYMPTOM_SEPARATOR = " \x1f"
+
+# Single alternation over the literal emergency phrases, longest first,
+# compiled once so each request is one linear scan
+_EMERGENCY_RE = re.compile(
+    "|".join(re.escape(s) for s in sorted(EMERGENCY_SYMPTOMS | {"nosebleed"}, key=len, reverse=True))
+)
 
 # Symptom to severity mapping
 SYMPTOM_SEVERITY_MAP = {
@@ -61,7 +90,6 @@ SYMPTOM_SEVERITY_MAP = {
     # Medium (40-69)
     "moderate fever": 55,
     "cough": 45,
-    "mild headache": 35,
     "diarrhea": 50,
     "fatigue": 40,
     "nausea": 45,
@@ -73,6 +101,184 @@ SYMPTOM_SEVERITY_MAP = {
     "mild rash": 30,
 }
 
+# Danger-sign keywords that escalate the final score, matched in the same pass
+_FLAG_BLEEDING = 1
+_FLAG_DURATION = 2
+_FLAG_KEYWORDS = {
+    "bleed": _FLAG_BLEEDING,
+    "blood": _FLAG_BLEEDING,
+    "vomit": _FLAG_BLEEDING,
+    "continuous": _FLAG_DURATION,
+    "ongoing": _FLAG_DURATION,
+    "persistent": _FLAG_DURATION,
+}
+
+class _KeywordTrie:
+    """
+    Pure-Python fallback for ahocorasick.Automaton
+    
+    Supports the same add_word / make_automaton / iter interface, walking a
+    dict-of-dicts trie from each start position so every overlapping
+    keyword match is reported in O(len(text) * longest keyword).
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add_word(self, key: str, value) -> None:
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[None] = value  # None never collides with a character key
+
+    def make_automaton(self) -> None:
+        pass
+
+    def iter(self, text: str):
+        root = self._root
+        for start in range(len(text)):
+            node = root
+            for end in range(start, len(text)):
+                node = node.get(text[end])
+                if node is None:
+                    break
+                if None in node:
+                    yield end, node[None]
+
+
+_Automaton = ahocorasick.Automaton if ahocorasick is not None else _KeywordTrie
+
+def _build_severity_automaton():
+    """
+    Aho-Corasick automaton over every severity and danger-sign keyword so
+    each symptom is scanned once; payload is (severity or None, flag bits).
+    Scoring takes the highest severity among all hits, so insertion order
+    is irrelevant.
+    """
+    automaton = _Automaton()
+    for keyword, severity in SYMPTOM_SEVERITY_MAP.items():
+        automaton.add_word(keyword, (severity, 0))
+    for keyword, flag in _FLAG_KEYWORDS.items():
+        automaton.add_word(keyword, (None, flag))
+    automaton.make_automaton()
+    return automaton
+
+
+_SEVERITY_AC = _build_severity_automaton()
+
+# Per-symptom explanations in priority order (first listed keyword wins)
+_EXPLANATIONS = (
+    ("fever", "Elevated body temperature may indicate infection, inflammation, or other medical condition"),
+    ("cough", "Respiratory symptom that may indicate viral/bacterial infection or other respiratory condition"),
+    ("headache", "Head pain that can have many causes including tension, migraines, or underlying conditions"),
+    ("fatigue", "General weakness or exhaustion that may indicate infection, sleep issues, or other conditions"),
+    ("pain", "Localized or general pain requiring proper medical evaluation"),
+)
+_DEFAULT_EXPLANATION = "Symptom requiring professional medical evaluation"
+
+_EXPLANATION_TEXT = dict(_EXPLANATIONS)
+_EXPLANATION_PRIORITY = {keyword: priority for priority, (keyword, _) in enumerate(_EXPLANATIONS)}
+_EXPLANATION_RE = re.compile("|".join(re.escape(keyword) for keyword, _ in _EXPLANATIONS))
+
+# Recommendations included in every analysis
+_BASE_RECOMMENDATIONS = (
+    "Consult a qualified healthcare provider for proper evaluation",
+    "Keep track of symptom progression and duration",
+    "Follow basic health precautions (hygiene, rest, hydration)"
+)
+
+# Emergency response (compatible with symptom response schema), built once
+_EMERGENCY_RESPONSE_TEMPLATE = {
+    "severity_score": 100,
+    "risk_level": "CRITICAL",
+    "is_emergency": True,
+    "symptoms_analysis": {},
+    "recommendations": [
+        "🚨 SEEK EMERGENCY CARE IMMEDIATELY (Call 911 or go to the ER)",
+        "Do not delay. Seek immediate professional medical care."
+    ],
+    "message": "🚨 EMERGENCY DETECTED 🚨\n\nYour symptoms may indicate a medical emergency. Call emergency services immediately.",
+    "disclaimer": MEDICAL_DISCLAIMER
+}
+
+# Keywords the condition-suggestion rules are built from, matched in one scan
+_CONDITION_KEYWORDS_RE = re.compile(r"vomit|blood|fever|stomach|abdominal|nausea|chest|headache")
+
+# Condition rules in output order: (tag, keyword groups that must all match,
+# keywords that must be absent). A group matches if any of its keywords is
+# present in any symptom. 'vomit_blood' needs both keywords in one symptom
+# and is evaluated separately.
+_TRIGGERS = (
+    ("fever_abdominal", (("fever",), ("stomach", "abdominal")), ()),
+    ("fever", (("fever",),), ("stomach", "abdominal")),
+    ("vomit_abdominal", (("vomit", "nausea"), ("stomach", "abdominal")), ()),
+    ("chest", (("chest",),), ()),
+    ("headache", (("headache",),), ()),
+)
+
+# Educational condition suggestions emitted for each triggered tag
+_TAG_TO_SUGGESTIONS = {
+    # Emergency-related suggestions
+    "vomit_blood": (
+        {
+            "condition": "Possible upper gastrointestinal bleeding (e.g., peptic ulcer, varices)",
+            "likelihood": "high",
+            "info": "Hematemesis (vomiting blood) can indicate bleeding in the upper GI tract and requires urgent medical evaluation. Seek emergency care."
+        },
+    ),
+    # Fever + severe systemic signs
+    "fever_abdominal": (
+        {
+            "condition": "Possible dengue or severe systemic infection",
+            "likelihood": "moderate",
+            "info": "High fever with severe abdominal pain can be seen in dengue and other systemic infections; evaluation and laboratory testing are often required."
+        },
+        {
+            "condition": "Possible gastroenteritis or foodborne illness",
+            "likelihood": "moderate",
+            "info": "Often includes fever, vomiting, and abdominal pain; usually self-limited but may require rehydration and assessment."
+        },
+    ),
+    "fever": (
+        {
+            "condition": "Possible viral infection (e.g., influenza)",
+            "likelihood": "moderate",
+            "info": "Fever with respiratory or constitutional symptoms commonly indicates a viral infection."
+        },
+    ),
+    # Vomiting and abdominal pain without notable fever
+    "vomit_abdominal": (
+        {
+            "condition": "Possible gastroenteritis or food poisoning",
+            "likelihood": "moderate",
+            "info": "Acute vomiting and abdominal pain are commonly due to gastroenteritis or foodborne causes; supportive care and hydration are important."
+        },
+    ),
+    # Chest-related symptoms
+    "chest": (
+        {
+            "condition": "Multiple possible causes (cardiac, pulmonary, musculoskeletal)",
+            "likelihood": "unknown",
+            "info": "Chest pain can indicate many conditions including cardiac ischemia; seek immediate medical assessment for chest pain especially if associated with shortness of breath or sweating."
+        },
+    ),
+    # Headache patterns
+    "headache": (
+        {
+            "condition": "Tension headache or migraine",
+            "likelihood": "moderate",
+            "info": "Headaches are a common symptom with many causes including tension-type headache and migraine; severe or sudden-onset headaches require urgent evaluation."
+        },
+    ),
+}
+
+# Suggestion used when no rule matches
+_DEFAULT_SUGGESTION = {
+    "condition": "Requires professional medical evaluation",
+    "likelihood": "unknown",
+    "info": "Symptoms are non-specific; consult a healthcare provider for appropriate history, examination, and testing to determine the cause."
+}
+
 # Risk level classification
 RISK_LEVELS = {
     "CRITICAL": (90, 100),
@@ -81,13 +287,33 @@ RISK_LEVELS = {
     "LOW": (0, 39)
 }
 
+# Risk levels that warrant prompt medical attention
+_HIGH_OR_CRITICAL = frozenset({"HIGH", "CRITICAL"})
+
+# Score (0-100) to risk level, precomputed so classification is one index
+_LEVEL_TABLE = tuple(
+    next(level for level, (min_score, max_score) in RISK_LEVELS.items() if min_score <= score <= max_score)
+    for score in range(101)
+)
+
+# Memo cache keys hold the client's symptom strings, so only small inputs are
+# cached; anything larger is computed directly and never retained
+_CACHE_MAX_SYMPTOMS = 20
+_CACHE_MAX_CHARS = 1000
 
-def calculate_severity_score(symptoms: List[str]) -> int:
+
+def _cacheable(symptoms: Sequence[str]) -> bool:
+    """Whether a symptom list is small enough to be used as a cache key"""
+    return len(symptoms) <= _CACHE_MAX_SYMPTOMS and sum(map(len, symptoms)) <= _CACHE_MAX_CHARS
+
+
+def calculate_severity_score(symptoms: List[str], symptoms_lower: List[str] = None) -> int:
     """
     Calculate severity score based on symptoms
     
     Args:
         symptoms: List of symptom strings
+        symptoms_lower: Precomputed lowercase symptoms (optional)
         
     Returns:
         Severity score 0-100
@@ -95,47 +321,93 @@ def calculate_severity_score(symptoms: List[str]) -> int:
     if not symptoms:
         return 0
     
-    # Convert all symptoms to lowercase for consistent matching
-    symptoms_lower = [s.lower() for s in symptoms]
+    if symptoms_lower is None:
+        symptoms_lower = [s.lower() for s in symptoms]
+    
+    if not _cacheable(symptoms_lower):
+        return _score_symptoms(symptoms_lower)
+    
+    # Score depends only on the multiset of symptoms, so sort for a stable cache key
+    return _severity_cached(tuple(sorted(symptoms_lower)))
+
+
+def calculate_severity_score_batch(batch: List[List[str]]) -> List[int]:
+    """
+    Calculate severity scores for many symptom lists at once
     
-    scores = []
-    for symptom in symptoms:
-        symptom_lower = symptom.lower()
+    Args:
+        batch: List of symptom lists
         
-        # Find matching severity
-        score = 20  # Default baseline
+    Returns:
+        Severity score 0-100 for each symptom list, in order
+    """
+    # Repeated symptom lists in a batch collapse onto the severity cache
+    return [calculate_severity_score(symptoms) for symptoms in batch]
+
+
+def detect_emergency_batch(batch: List[List[str]]) -> List[bool]:
+    """
+    Detect emergencies for many symptom lists at once
+    
+    Args:
+        batch: List of symptom lists
         
-        for known_symptom, severity in SYMPTOM_SEVERITY_MAP.items():
-            if known_symptom in symptom_lower:
+    Returns:
+        True for each symptom list that indicates an emergency, in order
+    """
+    return [detect_emergency(symptoms) for symptoms in batch]
+
+
+def _score_symptoms(symptoms_lower: Sequence[str]) -> int:
+    """Severity scoring over lowercased symptoms"""
+    # Reduce total, maximum and high-severity count in the matching loop
+    # itself rather than re-walking a score list
+    total = 0
+    maximum = 0
+    high_count = 0
+    flags = 0
+    for symptom_lower in symptoms_lower:
+        # Highest severity among all matching keywords
+        score = None
+        for _, (severity, flag) in _SEVERITY_AC.iter(symptom_lower):
+            flags |= flag
+            if severity is not None and (score is None or severity > score):
                 score = severity
-                break
         
-        scores.append(score)
+        if score is None:
+            score = 20  # Default baseline
+        
+        total += score
+        if score > maximum:
+            maximum = score
+        if score >= 80:
+            high_count += 1
     
     # Average with weight towards highest severity
-    average = sum(scores) / len(scores)
-    maximum = max(scores)
+    average = total / len(symptoms_lower)
     
     # Weight: 60% average + 40% max (emphasize worst symptom)
     final_score = int(average * 0.6 + maximum * 0.4)
 
     # Boosters for danger signs
     # If any bleeding or vomiting blood is present, escalate to critical
-    if any(('bleed' in s or 'blood' in s or 'vomit' in s) for s in symptoms_lower):
+    if flags & _FLAG_BLEEDING:
         final_score = max(final_score, 95)
 
     # If there are two or more high-severity items, escalate
-    high_count = sum(1 for sc in scores if sc >= 80)
     if high_count >= 2:
         final_score = max(final_score, 90)
 
     # Continuous or ongoing duration increases severity
-    if any('continuous' in s or 'ongoing' in s or 'persistent' in s for s in symptoms_lower):
+    if flags & _FLAG_DURATION:
         final_score = min(100, final_score + 10)
 
     return min(100, max(0, final_score))
 
 
+_severity_cached = functools.lru_cache(maxsize=4096)(_score_symptoms)
+
+
 def classify_risk_level(severity_score: int) -> Literal["CRITICAL", "HIGH", "MEDIUM", "LOW"]:
     """
     Classify risk level based on severity score
@@ -146,47 +418,40 @@ def classify_risk_level(severity_score: int) -> Literal["CRITICAL", "HIGH", "MED
     Returns:
         Risk level classification
     """
-    for level, (min_score, max_score) in RISK_LEVELS.items():
-        if min_score <= severity_score <= max_score:
-            return level
-    
-    return "LOW"
+    return _LEVEL_TABLE[max(0, min(100, severity_score))]
 
 
-def detect_emergency(symptoms: List[str]) -> bool:
+def detect_emergency(symptoms: List[str], symptoms_lower: List[str] = None) -> bool:
     """
     Detect if symptoms indicate emergency situation
     
     Args:
         symptoms: List of symptoms
+        symptoms_lower: Precomputed lowercase symptoms (optional)
         
     Returns:
         True if emergency detected
     """
-    symptoms_lower = [s.lower() for s in symptoms]
-
-    # Direct match against known emergency phrases
-    for emergency_symptom in EMERGENCY_SYMPTOMS:
-        if any(emergency_symptom in symptom for symptom in symptoms_lower):
-            return True
-
-    # Fuzzy checks for common danger combinations (e.g., 'vomit' + 'blood')
-    for s in symptoms_lower:
-        # Vomiting blood
-        if 'vomit' in s and 'blood' in s:
-            return True
-        if 'throw' in s and 'blood' in s:
-            return True
-        if 'severe' in s and ('bleed' in s or 'bleeding' in s):
-            return True
-        # Nosebleed / epistaxis
-        if ('nose' in s and 'bleed' in s) or 'epistaxis' in s or 'nosebleed' in s:
-            return True
-        # Continuous or ongoing bleeding considered urgent
-        if ('continuous' in s or 'ongoing' in s) and ('bleed' in s or 'bleeding' in s):
-            return True
-
-    return False
+    if symptoms_lower is None:
+        symptoms_lower = [s.lower() for s in symptoms]
+    
+    if not _cacheable(symptoms_lower):
+        return _emergency(symptoms_lower)
+    
+    return _emergency_cached(frozenset(symptoms_lower))
+
+
+def _emergency(symptoms_lower: Iterable[str]) -> bool:
+    """Emergency detection over lowercased symptoms; order is irrelevant"""
+    symptoms_lower = tuple(symptoms_lower)
+    if _EMERGENCY_RE.search(_SYMPTOM_SEPARATOR.join(symptoms_lower)):
+        return True
+    
+    # Danger combinations within a single symptom (e.g. 'vomit' + 'blood')
+    return any(a in s and b in s for s in symptoms_lower for a, b in _EMERGENCY_PAIRS)
+
+
+_emergency_cached = functools.lru_cache(maxsize=4096)(_emergency)
 
 
 def analyze_symptoms(
@@ -205,40 +470,51 @@ def analyze_symptoms(
     Returns:
         Analysis result dictionary
     """
-    severity_score = calculate_severity_score(symptoms)
-    risk_level = classify_risk_level(severity_score)
-    is_emergency = detect_emergency(symptoms)
+    # Symptoms are lowercased only when the analysis is actually computed,
+    # so a cache hit does no per-symptom work at all
+    if not _cacheable(symptoms):
+        return _analyze(symptoms, [s.lower() for s in symptoms], age, gender)
     
-    # Generate symptom analysis
-    symptoms_analysis = {}
-    for symptom in symptoms:
-        symptom_lower = symptom.lower()
-        
-        if "fever" in symptom_lower:
-            symptoms_analysis[symptom] = "Elevated body temperature may indicate infection, inflammation, or other medical condition"
-        elif "cough" in symptom_lower:
-            symptoms_analysis[symptom] = "Respiratory symptom that may indicate viral/bacterial infection or other respiratory condition"
-        elif "headache" in symptom_lower:
-            symptoms_analysis[symptom] = "Head pain that can have many causes including tension, migraines, or underlying conditions"
-        elif "fatigue" in symptom_lower:
-            symptoms_analysis[symptom] = "General weakness or exhaustion that may indicate infection, sleep issues, or other conditions"
-        elif "pain" in symptom_lower:
-            symptoms_analysis[symptom] = "Localized or general pain requiring proper medical evaluation"
-        else:
-            symptoms_analysis[symptom] = "Symptom requiring professional medical evaluation"
+    result = _analyze_cached(tuple(symptoms), age, gender)
     
-    # Generate recommendations
-    recommendations = [
-        "Consult a qualified healthcare provider for proper evaluation",
-        "Keep track of symptom progression and duration",
-        "Follow basic health precautions (hygiene, rest, hydration)"
-    ]
+    # Copy the mutable parts so callers cannot corrupt the cached entry
+    return {
+        **result,
+        "symptoms_analysis": dict(result["symptoms_analysis"]),
+        "recommendations": list(result["recommendations"])
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_cached(symptoms: Tuple[str, ...], age: int, gender: str) -> Dict:
+    """Memoized analysis keyed on the exact symptom list and demographics"""
+    # Lowercase here rather than in the key: it is derived from symptoms
+    return _analyze(symptoms, [s.lower() for s in symptoms], age, gender)
+
+
+def _analyze(symptoms: Sequence[str], symptoms_lower: Sequence[str], age: int, gender: str) -> Dict:
+    """Build the full analysis for a symptom list and demographics"""
+    severity_score = calculate_severity_score(symptoms, symptoms_lower)
+    risk_level = classify_risk_level(severity_score)
+    is_emergency = detect_emergency(symptoms, symptoms_lower)
+    
+    # Generate symptom analysis (a cached dict may be shared here; only
+    # analyze_symptoms hands results to callers, and it copies them)
+    if _cacheable(symptoms):
+        symptoms_analysis = _symptoms_analysis_cached(tuple(symptoms))
+    else:
+        symptoms_analysis = _build_symptoms_analysis(symptoms, symptoms_lower)
     
-    if risk_level in ["HIGH", "CRITICAL"]:
-        recommendations.insert(0, "⚠️ Seek medical attention promptly")
+    # Generate recommendations, most urgent first
+    recommendations = []
     
     if is_emergency:
-        recommendations.insert(0, "🚨 SEEK EMERGENCY CARE IMMEDIATELY (Call 911 or go to ER)")
+        recommendations.append("🚨 SEEK EMERGENCY CARE IMMEDIATELY (Call 911 or go to ER)")
+    
+    if risk_level in _HIGH_OR_CRITICAL:
+        recommendations.append("⚠️ Seek medical attention promptly")
+    
+    recommendations.extend(_BASE_RECOMMENDATIONS)
     
     return {
         "severity_score": severity_score,
@@ -252,9 +528,29 @@ def analyze_symptoms(
     }
 
 
+@functools.lru_cache(maxsize=2048)
+def _symptoms_analysis_cached(symptoms: Tuple[str, ...]) -> Dict[str, str]:
+    """Memoized per-symptom explanations, independent of demographics"""
+    return _build_symptoms_analysis(symptoms, [s.lower() for s in symptoms])
+
+
+def _build_symptoms_analysis(symptoms: Sequence[str], symptoms_lower: Sequence[str]) -> Dict[str, str]:
+    """Per-symptom explanations from the highest-priority matching keyword"""
+    symptoms_analysis = {}
+    for symptom, symptom_lower in zip(symptoms, symptoms_lower):
+        found = _EXPLANATION_RE.findall(symptom_lower)
+        if found:
+            symptoms_analysis[symptom] = _EXPLANATION_TEXT[min(found, key=_EXPLANATION_PRIORITY.__getitem__)]
+        else:
+            symptoms_analysis[symptom] = _DEFAULT_EXPLANATION
+    
+    return symptoms_analysis
+
+
 def get_condition_suggestions(
     symptoms: List[str],
-    medical_history: List[str] = None
+    medical_history: List[str] = None,
+    symptoms_lower: List[str] = None
 ) -> List[Dict]:
     """
     Generate possible condition suggestions (educational only)
@@ -262,96 +558,53 @@ def get_condition_suggestions(
     Args:
         symptoms: List of symptoms
         medical_history: Patient medical history
+        symptoms_lower: Precomputed lowercase symptoms (optional)
         
     Returns:
         List of possible conditions with educational information
     """
-    suggestions = []
+    if symptoms_lower is None:
+        symptoms_lower = [s.lower() for s in symptoms]
     
-    symptoms_lower = [s.lower() for s in symptoms]
-    symptoms_str = " ".join(symptoms_lower)
+    # Medical history does not influence the suggestions, so it is not part of the key
+    if _cacheable(symptoms_lower):
+        suggestions = _suggestions_cached(tuple(symptoms_lower))
+    else:
+        suggestions = _suggestions(symptoms_lower)
+    return [dict(c) for c in suggestions]
 
-    # Helper to add suggestion without duplicates
-    def add_suggestion(condition, likelihood, info):
-        cond = {"condition": condition, "likelihood": likelihood, "info": info}
-        if not any(c["condition"] == condition for c in suggestions):
-            suggestions.append(cond)
 
-    # Emergency-related suggestions
-    if any("vomit" in s and "blood" in s for s in symptoms_lower) or "vomiting blood" in symptoms_str:
-        add_suggestion(
-            "Possible upper gastrointestinal bleeding (e.g., peptic ulcer, varices)",
-            "high",
-            "Hematemesis (vomiting blood) can indicate bleeding in the upper GI tract and requires urgent medical evaluation. Seek emergency care."
-        )
-
-    # Fever + severe systemic signs
-    if "high fever" in symptoms_str or any("fever" in s for s in symptoms_lower):
-        if "severe stomach pain" in symptoms_str or any("stomach" in s or "abdominal" in s for s in symptoms_lower):
-            add_suggestion(
-                "Possible dengue or severe systemic infection",
-                "moderate",
-                "High fever with severe abdominal pain can be seen in dengue and other systemic infections; evaluation and laboratory testing are often required."
-            )
-            add_suggestion(
-                "Possible gastroenteritis or foodborne illness",
-                "moderate",
-                "Often includes fever, vomiting, and abdominal pain; usually self-limited but may require rehydration and assessment."
-            )
-        else:
-            add_suggestion(
-                "Possible viral infection (e.g., influenza)",
-                "moderate",
-                "Fever with respiratory or constitutional symptoms commonly indicates a viral infection."
-            )
+def _suggestions(symptoms_lower: Sequence[str]) -> List[Dict]:
+    """Condition suggestions over lowercased symptoms"""
+    # Rule keywords present in each symptom and across all symptoms
+    keyword_sets = [frozenset(_CONDITION_KEYWORDS_RE.findall(s)) for s in symptoms_lower]
+    keywords = frozenset().union(*keyword_sets)
 
-    # Vomiting and abdominal pain without notable fever
-    if any("vomit" in s or "nausea" in s for s in symptoms_lower) and any("stomach" in s or "abdominal" in s for s in symptoms_lower):
-        add_suggestion(
-            "Possible gastroenteritis or food poisoning",
-            "moderate",
-            "Acute vomiting and abdominal pain are commonly due to gastroenteritis or foodborne causes; supportive care and hydration are important."
-        )
+    triggered = []
+    if any({"vomit", "blood"} <= k for k in keyword_sets) or "vomiting blood" in " ".join(symptoms_lower):
+        triggered.append("vomit_blood")
+    for tag, required, excluded in _TRIGGERS:
+        if all(not keywords.isdisjoint(group) for group in required) and keywords.isdisjoint(excluded):
+            triggered.append(tag)
 
-    # Chest-related symptoms
-    if any("chest" in s for s in symptoms_lower):
-        add_suggestion(
-            "Multiple possible causes (cardiac, pulmonary, musculoskeletal)",
-            "unknown",
-            "Chest pain can indicate many conditions including cardiac ischemia; seek immediate medical assessment for chest pain especially if associated with shortness of breath or sweating."
-        )
-
-    # Headache patterns
-    if any("headache" in s for s in symptoms_lower):
-        add_suggestion(
-            "Tension headache or migraine",
-            "moderate",
-            "Headaches are a common symptom with many causes including tension-type headache and migraine; severe or sudden-onset headaches require urgent evaluation."
-        )
+    suggestions = [suggestion for tag in triggered for suggestion in _TAG_TO_SUGGESTIONS[tag]]
 
     # If no clear match, provide a general suggestion
     if not suggestions:
-        add_suggestion(
-            "Requires professional medical evaluation",
-            "unknown",
-            "Symptoms are non-specific; consult a healthcare provider for appropriate history, examination, and testing to determine the cause."
-        )
+        suggestions.append(_DEFAULT_SUGGESTION)
 
     # Return up to 4 suggestions to keep the list concise
     return suggestions[:4]
 
 
+_suggestions_cached = functools.lru_cache(maxsize=1024)(_suggestions)
+
+
 def generate_emergency_response() -> Dict:
     """Generate emergency response (compatible with symptom response schema)"""
+    # Fresh containers so callers cannot mutate the shared template
     return {
-        "severity_score": 100,
-        "risk_level": "CRITICAL",
-        "is_emergency": True,
+        **_EMERGENCY_RESPONSE_TEMPLATE,
         "symptoms_analysis": {},
-        "recommendations": [
-            "🚨 SEEK EMERGENCY CARE IMMEDIATELY (Call 911 or go to the ER)",
-            "Do not delay. Seek immediate professional medical care."
-        ],
-        "message": "🚨 EMERGENCY DETECTED 🚨\n\nYour symptoms may indicate a medical emergency. Call emergency services immediately.",
-        "disclaimer": MEDICAL_DISCLAIMER
+        "recommendations": list(_EMERGENCY_RESPONSE_TEMPLATE["recommendations"])
     }
@@ -3,20 +3,31 @@ MediOracle AI - FastAPI Medical Analysis Server
 Provides symptom analysis, risk assessment, and medical guardrails
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
 import logging
 
+from pydantic import BaseModel, ValidationError
+
 from schemas import (
-    SymptomAnalysisRequest,
     SymptomAnalysisResponse,
-    DetailedAnalysisRequest,
     DetailedAnalysisResponse,
-    HealthCheckResponse
+    BatchSeverityResponse,
+    HealthCheckResponse,
+    ADAPTERS,
+    JSON_SCHEMAS
 )
 from logic import (
     analyze_symptoms,
+    calculate_severity_score_batch,
+    classify_risk_level,
+    detect_emergency_batch,
     get_condition_suggestions,
     generate_emergency_response,
     MEDICAL_DISCLAIMER,
@@ -27,11 +38,50 @@ from logic import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Requests with more symptoms than this run the analysis in the threadpool
+# so a single large payload cannot stall the event loop
+_THREADPOOL_THRESHOLD = 20
+
+# Request bodies larger than this (in bytes) are validated in the threadpool;
+# the module-level adapters and validators are safe to share across threads
+_THREADPOOL_BODY_BYTES = 64 * 1024
+
+
+async def _run_analysis(symptom_count: int, func, *args, **kwargs):
+    """Run CPU-bound logic inline, or in the threadpool for large inputs"""
+    if symptom_count > _THREADPOOL_THRESHOLD:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+async def _parse_body(request: Request, validate_json: Callable[[bytes], Any]):
+    """
+    Parse and validate the raw JSON body in one pydantic-core pass
+    
+    Avoids FastAPI's json.loads + validate round trip through an intermediate
+    dict; errors are reported in FastAPI's usual 422 format.
+    """
+    body = await request.body()
+    try:
+        if len(body) > _THREADPOOL_BODY_BYTES:
+            return await run_in_threadpool(validate_json, body)
+        return validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+
+def _json_body(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAPI request body for routes that validate the raw body themselves"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
 # Lifespan context manager - properly defined
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("MediOracle AI FastAPI Server starting...")
+    # Build the OpenAPI document now; FastAPI caches it on the app, so
+    # /openapi.json never pays the schema generation cost on a request
+    app.openapi()
     yield
     # Shutdown
     logger.info("MediOracle AI FastAPI Server shutting down...")
@@ -41,7 +91,8 @@ app = FastAPI(
     title="MediOracle AI - Medical Analysis API",
     description="FastAPI backend for medical symptom analysis and risk assessment",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -53,11 +104,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Medical disclaimer header
-@app.middleware("http")
-async def add_medical_disclaimer_header(request, call_next):
-    response = await call_next(request)
-    response.headers["X-Medical-Disclaimer"] = "Educational information only. Not medical advice."
+# Medical disclaimer header, attached to every medical analysis response
+# (success, validation error and server error) rather than by a per-request
+# middleware, so health probes and docs skip it
+_DISCLAIMER_HEADERS = {"X-Medical-Disclaimer": "Educational information only. Not medical advice."}
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model once with its pydantic-core serializer
+    
+    Returning a Response directly skips FastAPI's response_model validation
+    and second encode.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        headers=_DISCLAIMER_HEADERS
+    )
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """FastAPI's usual 422 response, plus the medical disclaimer header"""
+    response = await request_validation_exception_handler(request, exc)
+    response.headers.update(_DISCLAIMER_HEADERS)
     return response
 
 
@@ -73,71 +144,99 @@ async def root():
     }
 
 
+# Health payload never changes, so it is serialized once for liveness probes
+_HEALTH_JSON = HealthCheckResponse.build({
+    "status": "ok",
+    "service": "MediOracle Medical Analysis",
+    "version": app.version
+}).model_dump_json().encode()
+
+
 @app.get("/health", response_model=HealthCheckResponse, tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "ok",
-        "service": "MediOracle Medical Analysis",
-        "version": "1.0.0"
-    }
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
-@app.post("/api/analyze-symptoms", response_model=SymptomAnalysisResponse, tags=["Medical Analysis"])
-async def analyze_symptoms_endpoint(request: SymptomAnalysisRequest):
+@app.post(
+    "/api/analyze-symptoms",
+    response_model=SymptomAnalysisResponse,
+    tags=["Medical Analysis"],
+    openapi_extra=_json_body(JSON_SCHEMAS["SymptomAnalysisRequest"])
+)
+async def analyze_symptoms_endpoint(http_request: Request):
     """
     Analyze symptoms and return severity score and risk level
     
     **Warning**: This is educational information only. Always consult with a healthcare provider.
     """
+    request = await _parse_body(http_request, ADAPTERS["symptom_request"].validate_json)
+    
     try:
+        count = len(request.symptoms)
+        
         # Check for emergency
-        if detect_emergency(request.symptoms):
+        if await _run_analysis(count, detect_emergency, request.symptoms):
             logger.warning(f"Emergency symptoms detected: {request.symptoms}")
-            return generate_emergency_response()
+            return _json_response(SymptomAnalysisResponse.build(generate_emergency_response()))
         
         # Analyze symptoms
-        result = analyze_symptoms(
+        result = await _run_analysis(
+            count,
+            analyze_symptoms,
             symptoms=request.symptoms,
             age=request.age,
             gender=request.gender
         )
         
-        return SymptomAnalysisResponse(
-            severity_score=result["severity_score"],
-            risk_level=result["risk_level"],
-            is_emergency=result["is_emergency"],
-            symptoms_analysis=result["symptoms_analysis"],
-            recommendations=result["recommendations"],
-            disclaimer=result["disclaimer"]
-        )
+        # Trusted analyzer output: skip validation (see _TrustedModel.build)
+        return _json_response(SymptomAnalysisResponse.build(result))
     
     except Exception as e:
         logger.error(f"Error analyzing symptoms: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e), headers=_DISCLAIMER_HEADERS)
 
 
-@app.post("/api/analyze", response_model=DetailedAnalysisResponse, tags=["Medical Analysis"])
-async def detailed_analysis_endpoint(request: DetailedAnalysisRequest):
+@app.post(
+    "/api/analyze",
+    # Emergencies are answered with the symptom response shape
+    response_model=DetailedAnalysisResponse | SymptomAnalysisResponse,
+    tags=["Medical Analysis"],
+    openapi_extra=_json_body(JSON_SCHEMAS["DetailedAnalysisRequest"])
+)
+async def detailed_analysis_endpoint(http_request: Request):
     """
     Perform detailed medical analysis with medical history consideration
     
     **Warning**: This is educational information only. Not a substitute for professional medical advice.
     """
+    request = await _parse_body(http_request, ADAPTERS["detailed_request"].validate_json)
+    
+    # Split symptoms if provided as single string, dropping empty entries
+    symptoms = [s for s in map(str.strip, request.symptoms.split(",")) if s] if isinstance(request.symptoms, str) else request.symptoms
+    if not symptoms:
+        raise RequestValidationError([{
+            "type": "value_error",
+            "loc": ("body", "symptoms"),
+            "msg": "Value error, at least one symptom is required",
+            "input": request.symptoms
+        }])
+    
     try:
-        # Split symptoms if provided as single string
-        symptoms = [s.strip() for s in request.symptoms.split(",")] if isinstance(request.symptoms, str) else request.symptoms
+        symptoms_lower = [s.lower() for s in symptoms]
+        count = len(symptoms_lower)
         
         # Check for emergency
-        if detect_emergency(symptoms):
+        if await _run_analysis(count, detect_emergency, symptoms, symptoms_lower):
             logger.warning(f"Emergency symptoms detected in detailed analysis")
-            return generate_emergency_response()
+            # Emergencies use the symptom response shape on every endpoint
+            return _json_response(SymptomAnalysisResponse.build(generate_emergency_response()))
         
         # Get analysis
-        analysis = analyze_symptoms(symptoms=symptoms)
+        analysis = await _run_analysis(count, analyze_symptoms, symptoms=symptoms)
         
         # Get condition suggestions
-        conditions = get_condition_suggestions(symptoms, request.medical_history)
+        conditions = await _run_analysis(count, get_condition_suggestions, symptoms, request.medical_history, symptoms_lower)
         
         # Determine when to seek help
         when_to_seek_help = [
@@ -150,23 +249,63 @@ async def detailed_analysis_endpoint(request: DetailedAnalysisRequest):
         ]
         
         # Risk factors
-        risk_factors = request.medical_history or []
+        risk_factors = list(request.medical_history)
         if request.current_medications:
             risk_factors.append(f"Currently taking: {', '.join(request.current_medications)}")
         
-        return DetailedAnalysisResponse(
-            symptom_assessment=f"Assessment based on reported symptoms: {', '.join(symptoms)}. Professional medical evaluation is essential for accurate diagnosis.",
-            possible_conditions=conditions,
-            severity_level=analysis["risk_level"],
-            recommended_actions=analysis["recommendations"],
-            risk_factors=risk_factors,
-            when_to_seek_help=when_to_seek_help,
-            disclaimer=MEDICAL_DISCLAIMER
-        )
+        return _json_response(DetailedAnalysisResponse.build({
+            "symptom_assessment": f"Assessment based on reported symptoms: {', '.join(symptoms)}. Professional medical evaluation is essential for accurate diagnosis.",
+            "possible_conditions": conditions,
+            "severity_level": analysis["risk_level"],
+            "recommended_actions": analysis["recommendations"],
+            "risk_factors": risk_factors,
+            "when_to_seek_help": when_to_seek_help,
+            "disclaimer": MEDICAL_DISCLAIMER
+        }))
     
     except Exception as e:
         logger.error(f"Error in detailed analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e), headers=_DISCLAIMER_HEADERS)
+
+
+@app.post(
+    "/api/analyze-batch",
+    response_model=BatchSeverityResponse,
+    tags=["Medical Analysis"],
+    openapi_extra=_json_body({"type": "array", "items": JSON_SCHEMAS["SymptomAnalysisRequest"]})
+)
+async def batch_analysis_endpoint(http_request: Request):
+    """
+    Score severity and risk level for many symptom lists in one call
+    
+    **Warning**: This is educational information only. Always consult with a healthcare provider.
+    """
+    # Validate the whole batch with the shared list adapter
+    requests = await _parse_body(http_request, ADAPTERS["symptom_list"].validate_json)
+    
+    try:
+        batch = [r.symptoms for r in requests]
+        count = sum(len(b) for b in batch)
+        
+        # Check each row for emergency; like the single-request path, an
+        # emergency is reported as score 100 / CRITICAL whatever its keywords
+        emergencies = await _run_analysis(count, detect_emergency_batch, batch)
+        if any(emergencies):
+            logger.warning(f"Emergency symptoms detected in {sum(emergencies)} batch row(s)")
+        
+        scores = await _run_analysis(count, calculate_severity_score_batch, batch)
+        scores = [100 if emergency else score for score, emergency in zip(scores, emergencies)]
+        
+        return _json_response(BatchSeverityResponse.build({
+            "severity_scores": scores,
+            "risk_levels": [classify_risk_level(score) for score in scores],
+            "is_emergency": emergencies,
+            "disclaimer": MEDICAL_DISCLAIMER
+        }))
+    
+    except Exception as e:
+        logger.error(f"Error in batch analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e), headers=_DISCLAIMER_HEADERS)
 
 
 # Custom exception handler
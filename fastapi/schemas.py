@@ -2,102 +2,192 @@
 Medical Analysis Schemas - Pydantic models for request/response validation
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Literal
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Annotated, Any, Literal
+from typing_extensions import NotRequired, TypedDict
+
+# Risk classification shared by all response models
+RiskLevel = Literal["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+# Gender values sent by the frontend forms (short and long forms)
+Gender = Literal["M", "F", "O", "Male", "Female", "Other"]
+
+# OpenAPI examples, defined once at module level and shared by reference
+_SYMPTOM_REQUEST_EXAMPLE = {
+    "symptoms": ["fever", "cough", "fatigue"],
+    "age": 35,
+    "gender": "M",
+    "duration": "3 days"
+}
+
+_SYMPTOM_RESPONSE_EXAMPLE = {
+    "severity_score": 65,
+    "risk_level": "MEDIUM",
+    "is_emergency": False,
+    "symptoms_analysis": {
+        "fever": "Elevated body temperature may indicate infection",
+        "cough": "Respiratory symptom",
+        "fatigue": "General weakness"
+    },
+    "recommendations": [
+        "Consult a healthcare provider",
+        "Monitor symptoms",
+        "Stay hydrated"
+    ],
+    "disclaimer": "This is educational information only. Seek professional medical advice."
+}
+
+_DETAILED_REQUEST_EXAMPLE = {
+    "symptoms": "persistent headache and dizziness",
+    "medical_history": ["hypertension"],
+    "current_medications": ["lisinopril"]
+}
+
+_DETAILED_RESPONSE_EXAMPLE = {
+    "symptom_assessment": "Combination of headache and dizziness warrants evaluation",
+    "possible_conditions": [
+        {"condition": "Tension headache", "likelihood": "moderate"},
+        {"condition": "Hypertensive crisis", "likelihood": "low"}
+    ],
+    "severity_level": "MEDIUM",
+    "recommended_actions": [
+        "Monitor blood pressure",
+        "Stay hydrated",
+        "Rest in quiet environment"
+    ],
+    "risk_factors": ["Existing hypertension"],
+    "when_to_seek_help": [
+        "Sudden severe pain",
+        "Vision changes",
+        "Loss of consciousness"
+    ],
+    "disclaimer": "This information is for educational purposes only."
+}
+
+_BATCH_RESPONSE_EXAMPLE = {
+    "severity_scores": [39, 100],
+    "risk_levels": ["LOW", "CRITICAL"],
+    "is_emergency": [False, True],
+    "disclaimer": "This is educational information only. Seek professional medical advice."
+}
+
+
+class _TrustedModel(BaseModel):
+    """Base for response models assembled from internal analyzer output"""
+
+    # Responses are write-once containers built from trusted data; subclasses
+    # inherit this config, which spells out the cheapest behaviour explicitly
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        validate_assignment=False,
+        arbitrary_types_allowed=False
+    )
+
+    @classmethod
+    def build(cls, data: dict[str, Any]):
+        """
+        Construct without validation
+        
+        Analyzer output is produced by our own logic and already has the
+        declared shape, so full validation on every request is wasted work.
+        Only declared fields are passed through; extra keys are dropped.
+        """
+        return cls.model_construct(**{name: data[name] for name in cls.model_fields if name in data})
+
+
+class _WithDisclaimer(_TrustedModel):
+    """Base for responses carrying the medical disclaimer"""
+    disclaimer: str = Field(..., description="Medical disclaimer")
+
 
 class SymptomAnalysisRequest(BaseModel):
     """Request schema for symptom analysis"""
-    symptoms: List[str] = Field(..., description="List of symptoms")
-    age: Optional[int] = Field(None, description="Patient age")
-    gender: Optional[str] = Field(None, description="Patient gender")
-    duration: Optional[str] = Field(None, description="Duration of symptoms")
+    # Declared first: pydantic validates fields in order, so the constraint
+    # most likely to reject a bad request is checked before anything else.
+    # A list (not Sequence) so the schema publishes minItems, not minLength
+    symptoms: list[str] = Field(..., min_length=1, description="List of symptoms")
+    age: Annotated[int, Field(strict=True, ge=0, le=150)] | None = Field(None, description="Patient age")
+    gender: Gender | None = Field(None, description="Patient gender")
+    duration: str | None = Field(None, description="Duration of symptoms")
 
-    class Config:
-        example = {
-            "symptoms": ["fever", "cough", "fatigue"],
-            "age": 35,
-            "gender": "M",
-            "duration": "3 days"
-        }
+    model_config = ConfigDict(json_schema_extra={"examples": [_SYMPTOM_REQUEST_EXAMPLE]})
 
 
-class SymptomAnalysisResponse(BaseModel):
+class SymptomAnalysisResponse(_WithDisclaimer):
     """Response schema for symptom analysis"""
     severity_score: int = Field(..., description="Severity score 0-100")
-    risk_level: Literal["LOW", "MEDIUM", "HIGH", "CRITICAL"] = Field(..., description="Risk classification")
+    risk_level: RiskLevel = Field(..., description="Risk classification")
     is_emergency: bool = Field(..., description="Whether emergency medical attention is needed")
-    symptoms_analysis: Dict[str, str] = Field(..., description="Analysis of each symptom")
-    recommendations: List[str] = Field(..., description="Medical recommendations")
-    disclaimer: str = Field(..., description="Medical disclaimer")
+    symptoms_analysis: Mapping[str, str] = Field(..., description="Analysis of each symptom")
+    recommendations: Sequence[str] = Field(..., description="Medical recommendations")
 
-    class Config:
-        example = {
-            "severity_score": 65,
-            "risk_level": "MEDIUM",
-            "is_emergency": False,
-            "symptoms_analysis": {
-                "fever": "Elevated body temperature may indicate infection",
-                "cough": "Respiratory symptom",
-                "fatigue": "General weakness"
-            },
-            "recommendations": [
-                "Consult a healthcare provider",
-                "Monitor symptoms",
-                "Stay hydrated"
-            ],
-            "disclaimer": "This is educational information only. Seek professional medical advice."
-        }
+    model_config = ConfigDict(json_schema_extra={"examples": [_SYMPTOM_RESPONSE_EXAMPLE]})
 
 
 class DetailedAnalysisRequest(BaseModel):
     """Request schema for detailed medical analysis"""
-    symptoms: str = Field(..., description="Description of symptoms")
-    medical_history: List[str] = Field(default=[], description="Relevant medical history")
-    current_medications: List[str] = Field(default=[], description="Current medications")
+    # Must contain something other than whitespace and commas, so splitting
+    # on commas always leaves at least one symptom
+    symptoms: str = Field(..., pattern=r"[^\s,]", description="Description of symptoms")
+    medical_history: tuple[str, ...] = Field(default=(), description="Relevant medical history")
+    current_medications: tuple[str, ...] = Field(default=(), description="Current medications")
+
+    model_config = ConfigDict(json_schema_extra={"examples": [_DETAILED_REQUEST_EXAMPLE]})
+
 
-    class Config:
-        example = {
-            "symptoms": "persistent headache and dizziness",
-            "medical_history": ["hypertension"],
-            "current_medications": ["lisinopril"]
-        }
+class ConditionEntry(TypedDict):
+    """Possible condition suggested by the analyzer (educational only)"""
+    condition: str
+    likelihood: str
+    info: NotRequired[str]
 
 
-class DetailedAnalysisResponse(BaseModel):
+class DetailedAnalysisResponse(_WithDisclaimer):
     """Response schema for detailed analysis"""
     symptom_assessment: str
-    possible_conditions: List[Dict[str, str]]
-    severity_level: str
-    recommended_actions: List[str]
-    risk_factors: List[str]
-    when_to_seek_help: List[str]
-    disclaimer: str
-
-    class Config:
-        example = {
-            "symptom_assessment": "Combination of headache and dizziness warrants evaluation",
-            "possible_conditions": [
-                {"condition": "Tension headache", "likelihood": "moderate"},
-                {"condition": "Hypertensive crisis", "likelihood": "low"}
-            ],
-            "severity_level": "MEDIUM",
-            "recommended_actions": [
-                "Monitor blood pressure",
-                "Stay hydrated",
-                "Rest in quiet environment"
-            ],
-            "risk_factors": ["Existing hypertension"],
-            "when_to_seek_help": [
-                "Sudden severe pain",
-                "Vision changes",
-                "Loss of consciousness"
-            ],
-            "disclaimer": "This information is for educational purposes only."
-        }
-
-
-class HealthCheckResponse(BaseModel):
+    possible_conditions: Sequence[ConditionEntry]
+    severity_level: RiskLevel
+    recommended_actions: Sequence[str]
+    risk_factors: Sequence[str]
+    when_to_seek_help: Sequence[str]
+
+    model_config = ConfigDict(json_schema_extra={"examples": [_DETAILED_RESPONSE_EXAMPLE]})
+
+
+class BatchSeverityResponse(_WithDisclaimer):
+    """Response schema for batch severity scoring"""
+    severity_scores: Sequence[int] = Field(..., description="Severity score 0-100 per request")
+    risk_levels: Sequence[RiskLevel] = Field(..., description="Risk classification per request")
+    is_emergency: Sequence[bool] = Field(..., description="Whether each request needs emergency medical attention")
+
+    model_config = ConfigDict(json_schema_extra={"examples": [_BATCH_RESPONSE_EXAMPLE]})
+
+
+class HealthCheckResponse(_TrustedModel):
     """Response schema for health check"""
     status: str
     service: str
     version: str
+
+
+# Validators built once at import rather than per request
+SYMPTOM_LIST_ADAPTER = TypeAdapter(list[SymptomAnalysisRequest])  # batch payloads
+
+# Read-only registry of every request validator, keyed by name, so all
+# schema building happens at import and endpoints share the instances
+ADAPTERS = MappingProxyType({
+    "symptom_request": TypeAdapter(SymptomAnalysisRequest),
+    "detailed_request": TypeAdapter(DetailedAnalysisRequest),
+    "symptom_list": SYMPTOM_LIST_ADAPTER,
+})
+
+# JSON schemas generated once at import, for routes that document their
+# request body by hand (see openapi_extra in main.py)
+JSON_SCHEMAS = MappingProxyType({
+    model.__name__: model.model_json_schema()
+    for model in (SymptomAnalysisRequest, DetailedAnalysisRequest)
+})